@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 import os
 import plotly.express as px
+from logistic_datasource import load_primary_data
 
 # Configurazione della pagina
 st.set_page_config(page_title="Logistics Dashboard", layout="wide")
@@ -21,18 +22,8 @@ def load_data(file_path):
         st.error(f"Errore nel caricamento del file: {e}")
         return None
 
-# Upload del file
-uploaded_file = st.file_uploader("Carica il file CSV dei dati logistici", type=['csv'])
-
-if uploaded_file is not None:
-    primary_data = pd.read_csv(uploaded_file)
-    st.success("✅ File caricato correttamente!")
-elif os.path.exists(default_file_path):
-    st.info("ℹ️ Nessun file caricato. Utilizzando il file predefinito.")
-    primary_data = load_data(default_file_path)
-else:
-    st.error("⚠️ Nessun file caricato e il file predefinito non è disponibile.")
-    st.stop()
+# Caricamento da upload, artifact precalcolato o file predefinito
+primary_data, artifact, dataset_key = load_primary_data(default_file_path, load_data)
 
 # Convertire le colonne di data in formato datetime
 # Versione alternativa con gestione più dettagliata
@@ -54,7 +45,7 @@ date_range = st.sidebar.date_input(
 )
 
 # Filtro per tipo di veicolo
-vehicle_types = primary_data['vehicleType'].unique()
+vehicle_types = list(primary_data['vehicleType'].unique())
 selected_vehicle_types = st.sidebar.multiselect(
     "Tipo di veicolo",
     options=vehicle_types,
@@ -80,7 +71,7 @@ with col3:
 
 # Statistiche sui materiali
 st.header("📦 Statistiche Materiali")
-material_stats = filtered_data.groupby('Material Shipped')['TRANSPORTATION_DISTANCE_IN_KM'].sum().sort_values(ascending=False)
+material_stats = filtered_data.groupby('Material Shipped', observed=True)['TRANSPORTATION_DISTANCE_IN_KM'].sum().sort_values(ascending=False)
 
 fig_materials = px.bar(
     x=material_stats.index[:10],  # Solo i top 10 materiali
@@ -92,7 +83,7 @@ st.plotly_chart(fig_materials, use_container_width=True)
 
 # Statistiche per veicoli
 st.header("🚛 Statistiche per Veicoli")
-vehicle_stats = filtered_data.groupby('vehicleType')['TRANSPORTATION_DISTANCE_IN_KM'].agg(['sum', 'mean', 'count']).round(2)
+vehicle_stats = filtered_data.groupby('vehicleType', observed=True)['TRANSPORTATION_DISTANCE_IN_KM'].agg(['sum', 'mean', 'count']).round(2)
 vehicle_stats.columns = ['Distanza Totale', 'Distanza Media', 'Numero Spedizioni']
 st.dataframe(vehicle_stats)
 
@@ -8,6 +8,11 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.impute import SimpleImputer
 import numpy as np
+from logistic_datasource import load_primary_data
+from logistic_precompute import load_artifact_part, index_mask, date_index_mask
+from logistic_models import prepare_features, align_features, search_models
+from logistic_lanes import location_table, build_lane_cube, cube_mask, lane_matrix, lane_kpis, top_lanes
+from logistic_sketches import SKETCH_FIELDS, build_daily_sketches, merge_daily_sketches
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
@@ -24,39 +29,32 @@ tab1, tab2, tab3 = st.tabs(["Dashboard", "Performance Analysis", "Predictions"])
 # Percorso del file predefinito
 default_file_path = os.path.join("sample_data", "Primary_data.csv")
 
+# Aggiungiamo le colonne simulate solo se non esistono già
+def add_simulated_columns(data):
+    if 'On_Time' not in data.columns:
+        data['On_Time'] = np.random.uniform(0.8, 1.0, len(data))
+        data['Load_Factor'] = np.random.uniform(0.5, 1.0, len(data))
+        data['Cost_per_KM'] = np.random.uniform(1.0, 2.0, len(data))
+        data['Fuel_Efficiency'] = np.random.uniform(25, 35, len(data))
+        data['Delivery_Status'] = np.random.choice(
+            ['On Time', 'Delayed', 'Early'], 
+            len(data), 
+            p=[0.7, 0.2, 0.1]
+        )
+    return data
+
 # Funzione per caricare i dati
 @st.cache_data
 def load_data(file_path):
     try:
         data = pd.read_csv(file_path)
-        # Aggiungiamo le colonne simulate solo se non esistono già
-        if 'On_Time' not in data.columns:
-            data['On_Time'] = np.random.uniform(0.8, 1.0, len(data))
-            data['Load_Factor'] = np.random.uniform(0.5, 1.0, len(data))
-            data['Cost_per_KM'] = np.random.uniform(1.0, 2.0, len(data))
-            data['Fuel_Efficiency'] = np.random.uniform(25, 35, len(data))
-            data['Delivery_Status'] = np.random.choice(
-                ['On Time', 'Delayed', 'Early'], 
-                len(data), 
-                p=[0.7, 0.2, 0.1]
-            )
-        return data
+        return add_simulated_columns(data)
     except Exception as e:
         st.error(f"Errore nel caricamento del file: {e}")
         return None
 
-# Upload del file
-uploaded_file = st.file_uploader("Carica il file CSV dei dati logistici", type=['csv'])
-
-if uploaded_file is not None:
-    primary_data = load_data(uploaded_file)
-    st.success("✅ File caricato correttamente!")
-elif os.path.exists(default_file_path):
-    st.info("ℹ️ Utilizzo del file predefinito")
-    primary_data = load_data(default_file_path)
-else:
-    st.error("⚠️ Nessun file caricato e il file predefinito non è disponibile.")
-    st.stop()
+# Caricamento da upload, artifact precalcolato o file predefinito
+primary_data, artifact, dataset_key = load_primary_data(default_file_path, load_data, add_simulated_columns)
 
 if primary_data is None:
     st.error("⚠️ Errore nel caricamento dei dati")
@@ -66,6 +64,32 @@ if primary_data is None:
 primary_data['BookingID_Date'] = pd.to_datetime(primary_data['BookingID_Date'], errors='coerce')
 primary_data['Data_Ping_time'] = pd.to_datetime(primary_data['Data_Ping_time'], errors='coerce')
 
+# Cubo delle lane costruito una sola volta per dataset (sola lettura:
+# cache_resource evita di serializzarlo a ogni rerun). La chiave e' quella del
+# dataset: per frame grandi Streamlit ne hasherebbe solo un campione
+@st.cache_resource(max_entries=2)
+def get_lane_cube(dataset_key, _data):
+    return build_lane_cube(_data)
+
+# Sketch giornalieri (conteggi distinti e top-N) costruiti una sola volta per dataset
+@st.cache_resource(max_entries=2)
+def get_daily_sketches(dataset_key, _data):
+    return build_daily_sketches(_data)
+
+# Parti dell'artifact lette su richiesta, una sola volta per versione
+@st.cache_resource(max_entries=2, show_spinner="Lettura dell'artifact precalcolato...")
+def get_artifact_part(dataset_key, name, _artifact):
+    return load_artifact_part(_artifact, name)
+
+# Con l'artifact gli aggregati sono gia' pronti
+if artifact is not None:
+    rollups = get_artifact_part(dataset_key, 'rollups', artifact)
+    lane_cube, lane_transit = rollups['lane_cube'], rollups['lane_transit']
+    daily_sketches = rollups['daily_sketches']
+else:
+    lane_cube, lane_transit = get_lane_cube(dataset_key, primary_data)
+    daily_sketches = get_daily_sketches(dataset_key, primary_data)
+
 # Tab 1: Dashboard principale
 with tab1:
     # Sidebar per i filtri
@@ -82,7 +106,7 @@ with tab1:
     )
 
     # Filtro per tipo di veicolo
-    vehicle_types = primary_data['vehicleType'].unique()
+    vehicle_types = list(primary_data['vehicleType'].unique())
     selected_vehicle_types = st.sidebar.multiselect(
         "Tipo di veicolo",
         options=vehicle_types,
@@ -90,7 +114,7 @@ with tab1:
     )
 
     # Filtro per materiale
-    materials = primary_data['Material Shipped'].unique()
+    materials = list(primary_data['Material Shipped'].unique())
     selected_materials = st.sidebar.multiselect(
         "Materiale trasportato",
         options=materials,
@@ -98,12 +122,21 @@ with tab1:
     )
 
     # Applicazione dei filtri
-    filtered_data = primary_data[
-        (primary_data['BookingID_Date'].dt.date >= date_range[0]) &
-        (primary_data['BookingID_Date'].dt.date <= date_range[1]) &
-        (primary_data['vehicleType'].isin(selected_vehicle_types)) &
-        (primary_data['Material Shipped'].isin(selected_materials))
-    ].copy()  # Aggiungiamo .copy() per evitare SettingWithCopyWarning
+    if artifact is not None:
+        # Filtri risolti sugli indici precalcolati dell'artifact
+        indexes = artifact['indexes']
+        filtered_data = primary_data[
+            date_index_mask(indexes['Giorno'], date_range, len(primary_data)) &
+            index_mask(indexes['vehicleType'], selected_vehicle_types, len(primary_data)) &
+            index_mask(indexes['Material Shipped'], selected_materials, len(primary_data))
+        ].copy()
+    else:
+        filtered_data = primary_data[
+            (primary_data['BookingID_Date'].dt.date >= date_range[0]) &
+            (primary_data['BookingID_Date'].dt.date <= date_range[1]) &
+            (primary_data['vehicleType'].isin(selected_vehicle_types)) &
+            (primary_data['Material Shipped'].isin(selected_materials))
+        ].copy()  # Aggiungiamo .copy() per evitare SettingWithCopyWarning
 
     # KPI principali
     st.header("📊 KPI Principali")
@@ -131,65 +164,110 @@ with tab1:
             "Fuel Efficiency",
             f"{filtered_data['Fuel_Efficiency'].mean():.1f} L/100km"
         )
+
+    # KPI di rete: gli sketch sono partizionati per giorno, quindi coprono il
+    # filtro sulle date; con filtri su veicoli o materiali si usa il valore esatto
+    use_sketches = (
+        len(selected_vehicle_types) == len(vehicle_types) and
+        len(selected_materials) == len(materials)
+    )
+    network_sketches = {}
+    if use_sketches:
+        for field in SKETCH_FIELDS:
+            network_sketches[field] = merge_daily_sketches(daily_sketches, date_range, field)
+
+    st.subheader("🔢 KPI di Rete")
+    network_cols = st.columns(len(SKETCH_FIELDS))
+    for network_col, (field, label) in zip(network_cols, SKETCH_FIELDS.items()):
+        if use_sketches:
+            distinct_count = network_sketches[field].distinct()
+        else:
+            distinct_count = filtered_data[field].nunique()
+        with network_col:
+            st.metric(label, f"{distinct_count:,}")
+    if use_sketches:
+        st.caption("Valori stimati (HyperLogLog / Count-Min) sul periodo selezionato")
+
+    # Classifica per volume di spedizioni
+    leaderboard_field = st.selectbox(
+        "Classifica per volume spedizioni",
+        list(SKETCH_FIELDS),
+        format_func=SKETCH_FIELDS.get
+    )
+    if use_sketches:
+        leaderboard = network_sketches[leaderboard_field].heavy_hitters(10)
+    else:
+        leaderboard = filtered_data[leaderboard_field].value_counts().loc[lambda counts: counts > 0].head(10)
+
+    if len(leaderboard) > 0:
+        fig_leaderboard = px.bar(
+            x=leaderboard.values,
+            y=leaderboard.index.astype(str),
+            orientation='h',
+            title=f"Top {len(leaderboard)} {SKETCH_FIELDS[leaderboard_field]} per Spedizioni",
+            labels={'x': 'Num. Spedizioni', 'y': SKETCH_FIELDS[leaderboard_field]}
+        )
+        fig_leaderboard.update_layout(yaxis={'categoryorder': 'total ascending'})
+        st.plotly_chart(fig_leaderboard, use_container_width=True)
 # Visualizzazione delle rotte su mappa
 st.header("🌎 Network Logistico")
 
-# Utilizziamo il caching per le trasformazioni dei dati
-@st.cache_data
-def prepare_map_data(data):
-    data = data.copy()
-    data['Origin_Coordinates'] = data['Org_lat_lon'].str.split(',').apply(lambda x: list(map(float, x)) if x is not None else [0, 0])
-    data['Destination_Coordinates'] = data['Des_lat_lon'].str.split(',').apply(lambda x: list(map(float, x)) if x is not None else [0, 0])
-    return data
+# Coordinate per localita': tabella precalcolata nell'artifact, altrimenti
+# costruita una sola volta per dataset invece di rileggere lat/lon per riga
+@st.cache_resource(max_entries=2)
+def get_locations(dataset_key, _data):
+    return location_table(_data)
 
-# Prepariamo i dati
-map_data = prepare_map_data(filtered_data)
+locations = artifact['locations'] if artifact is not None else get_locations(dataset_key, primary_data)
+coordinates = locations.drop_duplicates(subset=['Location']).set_index('Location')[['lat', 'lon']]
 
 # Creiamo la mappa
 fig_map = go.Figure()
 
 # Aggiungiamo solo un campione rappresentativo di linee (es. 100 linee)
-sample_size = min(100, len(map_data))
-sampled_data = map_data.sample(n=sample_size, random_state=42) if len(map_data) > sample_size else map_data
+sample_size = min(100, len(filtered_data))
+sampled_data = filtered_data.sample(n=sample_size, random_state=42) if len(filtered_data) > sample_size else filtered_data
+origin_coordinates = coordinates.reindex(list(sampled_data['Origin_Location'])).to_numpy()
+destination_coordinates = coordinates.reindex(list(sampled_data['Destination_Location'])).to_numpy()
 
 # Linee di connessione (ridotte)
-for idx, row in sampled_data.iterrows():
+for (org_lat, org_lon), (des_lat, des_lon) in zip(origin_coordinates, destination_coordinates):
     fig_map.add_trace(go.Scattermapbox(
-        lat=[row['Origin_Coordinates'][0], row['Destination_Coordinates'][0]],
-        lon=[row['Origin_Coordinates'][1], row['Destination_Coordinates'][1]],
+        lat=[org_lat, des_lat],
+        lon=[org_lon, des_lon],
         mode='lines',
         line=dict(width=1, color='rgba(0,0,0,0.1)'),
         showlegend=False
     ))
 
 # Punti di origine (unici)
-unique_origins = map_data.drop_duplicates(subset=['Origin_Location'])
+unique_origins = coordinates.reindex(list(filtered_data['Origin_Location'].dropna().unique()))
 fig_map.add_trace(go.Scattermapbox(
-    lat=unique_origins['Origin_Coordinates'].apply(lambda x: x[0]),
-    lon=unique_origins['Origin_Coordinates'].apply(lambda x: x[1]),
+    lat=unique_origins['lat'],
+    lon=unique_origins['lon'],
     mode='markers',
     marker=dict(size=8, color='blue'),
     name='Origine',
-    text=unique_origins['Origin_Location'],
+    text=unique_origins.index,
     hoverinfo='text'
 ))
 
 # Punti di destinazione (unici)
-unique_destinations = map_data.drop_duplicates(subset=['Destination_Location'])
+unique_destinations = coordinates.reindex(list(filtered_data['Destination_Location'].dropna().unique()))
 fig_map.add_trace(go.Scattermapbox(
-    lat=unique_destinations['Destination_Coordinates'].apply(lambda x: x[0]),
-    lon=unique_destinations['Destination_Coordinates'].apply(lambda x: x[1]),
+    lat=unique_destinations['lat'],
+    lon=unique_destinations['lon'],
     mode='markers',
     marker=dict(size=8, color='red'),
     name='Destinazione',
-    text=unique_destinations['Destination_Location'],
+    text=unique_destinations.index,
     hoverinfo='text'
 ))
 
 # Statistiche
 num_origins = len(unique_origins)
 num_destinations = len(unique_destinations)
-total_distance = map_data['TRANSPORTATION_DISTANCE_IN_KM'].sum()
+total_distance = filtered_data['TRANSPORTATION_DISTANCE_IN_KM'].sum()
 
 # Layout
 fig_map.update_layout(
@@ -230,7 +308,7 @@ col1, col2 = st.columns(2)
 
 with col1:
     # Statistiche dettagliate per materiale
-    material_stats = filtered_data.groupby('Material Shipped').agg({
+    material_stats = filtered_data.groupby('Material Shipped', observed=True).agg({
         'TRANSPORTATION_DISTANCE_IN_KM': ['sum', 'mean', 'min', 'max'],
         'BookingID': 'count'
     }).round(2)
@@ -250,7 +328,7 @@ with col1:
 
 with col2:
     # Prendiamo i top 15 materiali
-    material_dist = (filtered_data.groupby('Material Shipped')['TRANSPORTATION_DISTANCE_IN_KM']
+    material_dist = (filtered_data.groupby('Material Shipped', observed=True)['TRANSPORTATION_DISTANCE_IN_KM']
                     .sum()
                     .sort_values(ascending=True)
                     .tail(15))
@@ -309,7 +387,7 @@ with tab2:
 
     # Analisi veicoli
     st.subheader("Performance Veicoli")
-    vehicle_metrics = filtered_data.groupby('vehicleType').agg({
+    vehicle_metrics = filtered_data.groupby('vehicleType', observed=True).agg({
         'Load_Factor': 'mean',
         'On_Time': 'mean',
         'Fuel_Efficiency': 'mean',
@@ -318,70 +396,187 @@ with tab2:
 
     st.dataframe(vehicle_metrics)
 
+    # Analisi lane origine-destinazione (dal cubo, non dalle righe filtrate)
+    st.subheader("🛣️ Analisi Lane")
+    lanes = lane_matrix(
+        lane_cube,
+        lane_transit,
+        cube_mask(lane_cube, date_range, selected_vehicle_types, selected_materials)
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        lane_metric = st.selectbox(
+            "Ordina lane per",
+            ['Num. Spedizioni', 'Distanza Totale (KM)', 'Distanza Media (KM)',
+             'Quota On-Time', 'Transito Mediano (ore)']
+        )
+    with col2:
+        lane_order = st.radio("Ordine", ['Decrescente', 'Crescente'], horizontal=True)
+    with col3:
+        lane_k = st.slider("Numero di lane", 5, 50, 15)
+
+    top = top_lanes(lanes, lane_metric, lane_k, ascending=lane_order == 'Crescente')
+    st.metric("Lane attive", f"{len(lanes):,}")
+    st.dataframe(top.round(2))
+    st.caption(
+        "Transito mediano esatto per le lane a basso volume; stimato da istogramma "
+        "(colonna 'Mediana Stimata') per le lane con molte spedizioni nello stesso giorno."
+    )
+
+    if len(top) > 0:
+        fig_lanes = px.bar(
+            x=top[lane_metric].values,
+            y=[f"{o} → {d}" for o, d in top.index],
+            orientation='h',
+            title=f"Top {len(top)} Lane per {lane_metric}",
+            labels={'x': lane_metric, 'y': 'Lane'}
+        )
+        fig_lanes.update_layout(yaxis={'categoryorder': 'total ascending'})
+        st.plotly_chart(fig_lanes, use_container_width=True)
+
+    # Dettaglio di una singola lane
+    origins = lanes.index.get_level_values(0).dropna().unique()
+    if len(origins) > 0:
+        col1, col2 = st.columns(2)
+        with col1:
+            lane_origin = st.selectbox("Origine", sorted(origins))
+        with col2:
+            lane_destinations = lanes.loc[lane_origin].index.dropna()
+            lane_destination = st.selectbox("Destinazione", sorted(lane_destinations))
+        lane = lane_kpis(lanes, lane_origin, lane_destination)
+        if lane is not None:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Spedizioni", f"{lane['Num. Spedizioni']:,.0f}")
+            with col2:
+                st.metric("Distanza Media", f"{lane['Distanza Media (KM)']:.1f} km")
+            with col3:
+                st.metric("Quota On-Time", f"{lane['Quota On-Time']*100:.1f}%")
+            with col4:
+                prefix = "≈ " if lane['Mediana Stimata'] else ""
+                st.metric("Transito Mediano", f"{prefix}{lane['Transito Mediano (ore)']:.1f} h")
+
+# Ricerca modelli in cache per versione del dataset filtrato e target
+# (limitata: ogni voce contiene lo stimatore migliore serializzato)
+@st.cache_data(max_entries=4, ttl=3600, show_spinner="Cross-validation e ricerca iperparametri in corso...")
+def run_model_search(dataset_version, target_col, n_splits, n_candidates, _data):
+    return search_models(_data, target_col, n_splits, n_candidates)
+
 # Tab 3: Predictions
 with tab3:
     st.header("🔮 Previsioni")
 
     if len(filtered_data) > 0:
-        # Feature Engineering
-        def prepare_features(data):
-            features = pd.DataFrame()
-            
-            # Features temporali
-            features['month'] = data['BookingID_Date'].dt.month
-            features['day_of_week'] = data['BookingID_Date'].dt.dayofweek
-            
-            # One-hot encoding
-            vehicle_dummies = pd.get_dummies(data['vehicleType'], prefix='vehicle')
-            material_dummies = pd.get_dummies(data['Material Shipped'], prefix='material')
-            
-            return pd.concat([features, vehicle_dummies, material_dummies], axis=1)
-
         # Training del modello
         target_col = st.selectbox(
             "Seleziona variabile target",
             ['TRANSPORTATION_DISTANCE_IN_KM', 'Cost_per_KM', 'Fuel_Efficiency']
         )
 
-        if st.button("Addestra Modello"):
-            try:
-                X = prepare_features(filtered_data)
-                y = filtered_data[target_col]
+        # Modello pre-addestrato sull'intero storico (se presente nell'artifact)
+        if artifact is not None and target_col in artifact['manifest']['models']:
+            if st.button("Usa Modello Pre-addestrato"):
+                models = get_artifact_part(dataset_key, 'models', artifact)
+                st.session_state['model'], st.session_state['feature_columns'] = models[target_col]
+                st.success("✅ Modello pre-addestrato caricato")
+
+        eval_mode = st.radio(
+            "Modalità di valutazione",
+            ['Addestramento rapido', 'Cross-validation e ricerca iperparametri'],
+            horizontal=True
+        )
+
+        if eval_mode == 'Addestramento rapido':
+            if st.button("Addestra Modello"):
+                try:
+                    X = prepare_features(filtered_data)
+                    y = filtered_data[target_col]
+
+                    X_train, X_test, y_train, y_test = train_test_split(
+                        X, y, test_size=0.2, random_state=42
+                    )
+
+                    model = RandomForestRegressor(n_estimators=100, random_state=42)
+                    model.fit(X_train, y_train)
 
-                X_train, X_test, y_train, y_test = train_test_split(
-                    X, y, test_size=0.2, random_state=42
-                )
+                    train_score = model.score(X_train, y_train)
+                    test_score = model.score(X_test, y_test)
 
-                model = RandomForestRegressor(n_estimators=100, random_state=42)
-                model.fit(X_train, y_train)
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.metric("R² Training", f"{train_score:.3f}")
+                    with col2:
+                        st.metric("R² Test", f"{test_score:.3f}")
 
-                train_score = model.score(X_train, y_train)
-                test_score = model.score(X_test, y_test)
+                    # Feature Importance
+                    feature_importance = pd.DataFrame({
+                        'feature': X.columns,
+                        'importance': model.feature_importances_
+                    }).sort_values('importance', ascending=False)
 
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("R² Training", f"{train_score:.3f}")
-                with col2:
-                    st.metric("R² Test", f"{test_score:.3f}")
+                    st.plotly_chart(px.bar(
+                        feature_importance.head(10),
+                        x='importance',
+                        y='feature',
+                        title="Feature Importance"
+                    ))
 
-                # Feature Importance
-                feature_importance = pd.DataFrame({
-                    'feature': X.columns,
-                    'importance': model.feature_importances_
-                }).sort_values('importance', ascending=False)
+                    st.session_state['model'] = model
+                    st.session_state['feature_columns'] = X.columns
 
-                st.plotly_chart(px.bar(
-                    feature_importance.head(10),
-                    x='importance',
-                    y='feature',
-                    title="Feature Importance"
-                ))
+                except Exception as e:
+                    st.error(f"Errore nel training: {str(e)}")
+        else:
+            st.caption(
+                "Cross-validation in ordine temporale su BookingID_Date e ricerca a "
+                "successive halving su Random Forest e Gradient Boosting, in parallelo su tutti i core"
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                cv_splits = st.slider("Numero di fold", 3, 10, 5)
+            with col2:
+                cv_candidates = st.slider("Candidati per modello", 4, 32, 8)
 
-                st.session_state['model'] = model
-                st.session_state['feature_columns'] = X.columns
+            if st.button("Avvia Ricerca"):
+                try:
+                    model_columns = ['BookingID_Date', 'vehicleType', 'Material Shipped', target_col]
+                    dataset_version = int(pd.util.hash_pandas_object(
+                        filtered_data[model_columns], index=False
+                    ).sum())
+                    results, best_name, best_model, feature_columns = run_model_search(
+                        dataset_version, target_col, cv_splits, cv_candidates, filtered_data
+                    )
+                    best = results.iloc[0]
+
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("Modello Migliore", best_name)
+                    with col2:
+                        st.metric(
+                            "R² CV",
+                            f"{best['R² CV medio']:.3f}",
+                            f"± {best['R² CV dev. std']:.3f}",
+                            delta_color="off"
+                        )
+                    with col3:
+                        st.metric(
+                            "Tempo Fit Configurazione",
+                            f"{best['Tempo fit configurazione (s)']:.2f} s",
+                            f"ricerca {best['Tempo ricerca (s)']:.1f} s",
+                            delta_color="off"
+                        )
+                    with col4:
+                        st.metric("Memoria Modello", f"{best['Memoria modello (MB)']:.2f} MB")
+
+                    st.write(f"Configurazione migliore: `{best['Parametri migliori']}`")
+                    st.dataframe(results.astype({'Parametri migliori': str}).round(3))
+
+                    st.session_state['model'] = best_model
+                    st.session_state['feature_columns'] = feature_columns
 
-            except Exception as e:
-                st.error(f"Errore nel training: {str(e)}")
+                except Exception as e:
+                    st.error(f"Errore nella ricerca: {str(e)}")
 
         # Previsioni
         if 'model' in st.session_state:
@@ -404,15 +599,10 @@ with tab3:
                         'Material Shipped': [pred_material]
                     })
 
-                    X_pred = prepare_features(pred_data)
-                    
-                    # Aggiungi colonne mancanti
-                    for col in st.session_state['feature_columns']:
-                        if col not in X_pred.columns:
-                            X_pred[col] = 0
-                    
-                    # Riordina le colonne
-                    X_pred = X_pred[st.session_state['feature_columns']]
+                    X_pred = align_features(
+                        prepare_features(pred_data),
+                        st.session_state['feature_columns']
+                    )
                     
                     prediction = st.session_state['model'].predict(X_pred)
                     
@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 import os
 import plotly.express as px
+from logistic_datasource import load_primary_data
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import warnings
@@ -27,18 +28,8 @@ def load_data(file_path):
         st.error(f"Errore nel caricamento del file: {e}")
         return None
 
-# Upload del file
-uploaded_file = st.file_uploader("Carica il file CSV dei dati logistici", type=['csv'])
-
-if uploaded_file is not None:
-    primary_data = pd.read_csv(uploaded_file)
-    st.success("✅ File caricato correttamente!")
-elif os.path.exists(default_file_path):
-    st.info("ℹ️ Utilizzo del file predefinito")
-    primary_data = load_data(default_file_path)
-else:
-    st.error("⚠️ Nessun file caricato e il file predefinito non è disponibile.")
-    st.stop()
+# Caricamento da upload, artifact precalcolato o file predefinito
+primary_data, artifact, dataset_key = load_primary_data(default_file_path, load_data)
 
 if primary_data is None:
     st.error("⚠️ Errore nel caricamento dei dati")
@@ -61,7 +52,7 @@ date_range = st.sidebar.date_input(
 )
 
 # Filtro per tipo di veicolo
-vehicle_types = primary_data['vehicleType'].unique()
+vehicle_types = list(primary_data['vehicleType'].unique())
 selected_vehicle_types = st.sidebar.multiselect(
     "Tipo di veicolo",
     options=vehicle_types,
@@ -69,7 +60,7 @@ selected_vehicle_types = st.sidebar.multiselect(
 )
 
 # Filtro per materiale
-materials = primary_data['Material Shipped'].unique()
+materials = list(primary_data['Material Shipped'].unique())
 selected_materials = st.sidebar.multiselect(
     "Materiale trasportato",
     options=materials,
@@ -165,7 +156,7 @@ col1, col2 = st.columns(2)
 
 with col1:
     # Statistiche per materiale
-    material_stats = filtered_data.groupby('Material Shipped').agg({
+    material_stats = filtered_data.groupby('Material Shipped', observed=True).agg({
         'TRANSPORTATION_DISTANCE_IN_KM': ['sum', 'mean', 'count']
     }).round(2)
     material_stats.columns = ['Distanza Totale', 'Distanza Media', 'Numero Spedizioni']
@@ -173,7 +164,7 @@ with col1:
 
 with col2:
     # Top 10 materiali
-    top_materials = filtered_data.groupby('Material Shipped')['TRANSPORTATION_DISTANCE_IN_KM'].sum().sort_values(ascending=True).tail(10)
+    top_materials = filtered_data.groupby('Material Shipped', observed=True)['TRANSPORTATION_DISTANCE_IN_KM'].sum().sort_values(ascending=True).tail(10)
     
     fig_materials = px.bar(
         y=top_materials.index,
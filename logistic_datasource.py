@@ -0,0 +1,80 @@
+
+import streamlit as st
+import os
+from logistic_ingest import UPLOAD_TYPES, payload_digest, combine_digests, load_uploads
+from logistic_precompute import ARTIFACT_ENV, load_artifact, resolve_artifact
+
+# Sorgente dei dati comune alle dashboard: file caricati (CSV, .csv.gz, .zip),
+# artifact precalcolato con logistic_precompute.py oppure file predefinito.
+# prepare: funzione opzionale applicata una sola volta ai dati caricati.
+
+
+def upload_digest(uploaded_files):
+    # Impronta di ogni file calcolata una sola volta per upload (file_id) e
+    # conservata nella sessione: i rerun non rileggono tutti i byte caricati
+    known = st.session_state.get('_upload_digests', {})
+    digests = {
+        f.file_id: known.get(f.file_id) or payload_digest(f.getvalue())
+        for f in uploaded_files
+    }
+    st.session_state['_upload_digests'] = digests
+    return combine_digests(digests[f.file_id] for f in uploaded_files)
+
+
+# Lettura dei file dell'upload, in cache per contenuto
+@st.cache_data(show_spinner="Lettura dei file caricati...")
+def load_uploaded_data(digest, _uploaded_files, prepare=None):
+    data = load_uploads([(f.name, f.getvalue()) for f in _uploaded_files])
+    return prepare(data) if prepare else data
+
+
+# Artifact aperto in memory-map e condiviso tra le sessioni
+@st.cache_resource(max_entries=1, show_spinner="Apertura dell'artifact precalcolato...")
+def get_artifact(path, prepare=None):
+    artifact = load_artifact(path)
+    if prepare:
+        # Applicata una sola volta: i dati restano stabili tra i rerun
+        artifact['data'] = prepare(artifact['data'])
+    return artifact
+
+
+def load_primary_data(default_file_path, load_default, prepare=None):
+    # Restituisce (dati, artifact, chiave del dataset); artifact e' None fuori
+    # dalla modalita' artifact. La chiave identifica il contenuto (impronta
+    # dell'upload, versione dell'artifact, file e data di modifica) ed e' usata
+    # dalle cache al posto dell'hash dell'intero DataFrame
+    uploaded_files = st.file_uploader(
+        "Carica i file dei dati logistici (CSV, .csv.gz o .zip)",
+        type=UPLOAD_TYPES,
+        accept_multiple_files=True
+    )
+    # Percorso dell'artifact nella variabile d'ambiente LOGISTIC_ARTIFACT
+    artifact_path = os.environ.get(ARTIFACT_ENV)
+
+    if uploaded_files:
+        try:
+            digest = upload_digest(uploaded_files)
+            data = load_uploaded_data(digest, uploaded_files, prepare)
+        except Exception as e:
+            st.error(f"Errore nel caricamento del file: {e}")
+            st.stop()
+        st.success(f"✅ {len(uploaded_files)} file caricati correttamente!")
+        return data, None, f"upload:{digest}"
+
+    if artifact_path:
+        try:
+            artifact = get_artifact(resolve_artifact(artifact_path), prepare)
+        except Exception as e:
+            st.error(f"Errore nel caricamento dell'artifact: {e}")
+            st.stop()
+        st.info(f"ℹ️ Utilizzo dell'artifact precalcolato {artifact['manifest']['version']}")
+        # Copia superficiale: l'artifact e' condiviso tra le sessioni
+        return artifact['data'].copy(deep=False), artifact, f"artifact:{artifact['manifest']['version']}"
+
+    if os.path.exists(default_file_path):
+        st.info("ℹ️ Utilizzo del file predefinito")
+        stat = os.stat(default_file_path)
+        return load_default(default_file_path), None, f"file:{default_file_path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    st.error("⚠️ Nessun file caricato e il file predefinito non è disponibile.")
+    st.stop()
@@ -0,0 +1,98 @@
+
+import pandas as pd
+import os
+import io
+import contextlib
+import gzip
+import zipfile
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Caricamento dei file esportati dal TMS: CSV semplici, CSV compressi (.csv.gz)
+# e archivi .zip con piu' file. Ogni CSV viene decompresso e letto
+# direttamente dallo stream, e i file vengono letti in parallelo.
+
+UPLOAD_TYPES = ['csv', 'gz', 'zip']
+
+# Codici e identificativi restano stringhe: valori come 410501 e CHEAMBWABCCA1
+# convivono nella stessa colonna e ogni file deve produrre lo stesso tipo
+STRING_COLUMNS = [
+    'BookingID', 'vehicle_no', 'OriginLocation_Code', 'DestinationLocation_Code',
+    'customerID', 'customerNameCode', 'supplierID', 'supplierNameCode'
+]
+
+
+def payload_digest(payload):
+    return hashlib.sha256(payload).digest()
+
+
+def combine_digests(digests):
+    # Impronta dell'insieme di file a partire da quelle dei singoli file
+    digest = hashlib.sha256()
+    for part in digests:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def content_digest(payloads):
+    # Impronta del contenuto caricato, usata come chiave della cache
+    return combine_digests(payload_digest(payload) for payload in payloads)
+
+
+def _is_csv(name):
+    # Esclude i file nascosti (es. AppleDouble '._nome.csv' creati da macOS)
+    base = os.path.basename(name)
+    if base.startswith('.') or name.startswith('__MACOSX/') or '/__MACOSX/' in name:
+        return False
+    return base.lower().endswith('.csv') or base.lower().endswith('.csv.gz')
+
+
+@contextlib.contextmanager
+def _open_member(archive, member):
+    # Chiude archivio, membro e stream gzip al termine della lettura
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf, zf.open(member) as handle:
+        if member.lower().endswith('.gz'):
+            with gzip.open(handle) as stream:
+                yield stream
+        else:
+            yield handle
+
+
+def csv_sources(name, payload):
+    # Elenco di (nome, apertura dello stream) per ogni CSV contenuto nell'upload
+    lower = name.lower()
+    if lower.endswith('.zip'):
+        with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+            members = [
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and _is_csv(info.filename)
+            ]
+        return [
+            (f"{name}/{member}", lambda member=member: _open_member(payload, member))
+            for member in members
+        ]
+    if lower.endswith('.gz'):
+        return [(name, lambda: gzip.open(io.BytesIO(payload)))]
+    return [(name, lambda: io.BytesIO(payload))]
+
+
+def read_csv_stream(open_stream):
+    # Lettura in un'unica chiamata: a blocchi ogni blocco dedurrebbe il proprio tipo
+    with open_stream() as handle:
+        return pd.read_csv(
+            handle,
+            low_memory=False,
+            dtype={col: str for col in STRING_COLUMNS}
+        )
+
+
+def load_uploads(uploads, max_workers=None):
+    # uploads: lista di (nome file, contenuto in bytes)
+    sources = [source for name, payload in uploads for source in csv_sources(name, payload)]
+    if not sources:
+        raise ValueError("Nessun file CSV trovato nei file caricati")
+
+    # Decompressione e parsing rilasciano il GIL: bastano i thread
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(sources), os.cpu_count() or 1)) as pool:
+        frames = list(pool.map(read_csv_stream, [open_stream for _, open_stream in sources]))
+    return pd.concat(frames, ignore_index=True)
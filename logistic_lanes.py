@@ -0,0 +1,190 @@
+
+import pandas as pd
+import numpy as np
+
+# Matrice origine-destinazione (OD) per l'analisi delle lane.
+# Il cubo viene costruito una sola volta per dataset: ogni cella aggrega le
+# spedizioni per (giorno, lane, tipo veicolo, materiale) con misure additive,
+# cosi' i filtri della sidebar si risolvono sommando celle del cubo invece di
+# rileggere le righe originali.
+
+LANE_KEYS = ['OriginLocation_Code', 'DestinationLocation_Code']
+CUBE_KEYS = ['Giorno'] + LANE_KEYS + ['vehicleType', 'Material Shipped']
+
+# Tempi di transito (ore): per le celle piccole si conservano i valori grezzi,
+# cosi' la mediana per lane e' esatta; per le celle con molte spedizioni si usa
+# un istogramma sparso a bin geometrici, additivo tra celle, e la mediana delle
+# lane che le contengono e' stimata (colonna 'Mediana Stimata')
+EXACT_CELL_LIMIT = 32
+TRANSIT_BINS = np.concatenate([[0.0], np.geomspace(1, 24 * 90, 63)])
+
+LANE_COLUMNS = [
+    'Num. Spedizioni',
+    'Distanza Totale (KM)',
+    'Distanza Media (KM)',
+    'Quota On-Time',
+    'Transito Mediano (ore)',
+    'Mediana Stimata'
+]
+
+
+def location_table(data):
+    # Una riga per localita' (origine o destinazione) con codice e coordinate
+    origins = data[['OriginLocation_Code', 'Origin_Location', 'Org_lat_lon']]
+    destinations = data[['DestinationLocation_Code', 'Destination_Location', 'Des_lat_lon']]
+    origins.columns = destinations.columns = ['Code', 'Location', 'lat_lon']
+    locations = pd.concat([origins, destinations]).drop_duplicates(subset=['Code', 'Location'])
+    coordinates = locations['lat_lon'].str.split(',', expand=True)
+    locations['lat'] = pd.to_numeric(coordinates[0], errors='coerce')
+    locations['lon'] = pd.to_numeric(coordinates[1], errors='coerce')
+    return locations.drop(columns='lat_lon').reset_index(drop=True)
+
+
+def transit_hours(data):
+    # Tempo di transito: fine viaggio, altrimenti arrivo effettivo
+    start = pd.to_datetime(data['trip_start_date'], errors='coerce')
+    end = pd.to_datetime(data['trip_end_date'], errors='coerce')
+    end = end.fillna(pd.to_datetime(data['actual_eta'], errors='coerce'))
+    hours = (end - start).dt.total_seconds() / 3600
+    return hours.where(hours >= 0)
+
+
+def build_lane_cube(data):
+    keys = pd.DataFrame({
+        'Giorno': pd.to_datetime(data['BookingID_Date'], errors='coerce').dt.date,
+        'OriginLocation_Code': data['OriginLocation_Code'],
+        'DestinationLocation_Code': data['DestinationLocation_Code'],
+        'vehicleType': data['vehicleType'],
+        'Material Shipped': data['Material Shipped']
+    })
+    km = data['TRANSPORTATION_DISTANCE_IN_KM']
+    measures = pd.DataFrame({
+        'count': 1,
+        'km_sum': km.fillna(0),
+        'km_count': km.notna().astype(int),
+        'ontime_count': (data['ontime'] == 'G').astype(int)
+    }, index=data.index)
+
+    grouped = pd.concat([keys, measures], axis=1).groupby(CUBE_KEYS, dropna=False, sort=False)
+    cube = grouped.sum().reset_index()
+
+    # Transiti per cella: valori grezzi per le celle piccole, terne sparse
+    # (cella, bin, conteggio) per le altre
+    hours = transit_hours(data).to_numpy()
+    valid = ~np.isnan(hours)
+    cell_id = grouped.ngroup().to_numpy()[valid]
+    hours = hours[valid]
+    small = np.bincount(cell_id, minlength=len(cube))[cell_id] <= EXACT_CELL_LIMIT
+
+    keys, counts = np.unique(
+        cell_id[~small].astype(np.int64) * (len(TRANSIT_BINS) - 1) + _transit_bin(hours[~small]),
+        return_counts=True
+    )
+    transit = {
+        'cells': len(cube),
+        'raw_cell': cell_id[small].astype(np.int32),
+        'raw_hours': hours[small],
+        'hist_cell': (keys // (len(TRANSIT_BINS) - 1)).astype(np.int32),
+        'hist_bin': (keys % (len(TRANSIT_BINS) - 1)).astype(np.int16),
+        'hist_count': counts.astype(np.int32)
+    }
+    return cube, transit
+
+
+def _transit_bin(hours):
+    return np.clip(np.searchsorted(TRANSIT_BINS, hours, side='right') - 1, 0, len(TRANSIT_BINS) - 2)
+
+
+def cube_mask(cube, date_range=None, vehicle_types=None, materials=None):
+    mask = np.ones(len(cube), dtype=bool)
+    if date_range is not None:
+        mask &= ((cube['Giorno'] >= date_range[0]) & (cube['Giorno'] <= date_range[1])).to_numpy()
+    if vehicle_types is not None:
+        mask &= cube['vehicleType'].isin(vehicle_types).to_numpy()
+    if materials is not None:
+        mask &= cube['Material Shipped'].isin(materials).to_numpy()
+    return mask
+
+
+def _hist_median(hist):
+    # Mediana interpolata linearmente all'interno del bin che la contiene
+    totals = hist.sum(axis=1)
+    cum = np.cumsum(hist, axis=1)
+    half = totals / 2
+    idx = np.minimum((cum < half[:, None]).sum(axis=1), hist.shape[1] - 1)
+    rows = np.arange(len(hist))
+    prev = np.where(idx > 0, cum[rows, idx - 1], 0)
+    in_bin = hist[rows, idx]
+    frac = np.divide(half - prev, in_bin, out=np.zeros(len(hist)), where=in_bin > 0)
+    lo, hi = TRANSIT_BINS[idx], TRANSIT_BINS[idx + 1]
+    return np.where(totals > 0, lo + frac * (hi - lo), np.nan)
+
+
+def _lane_medians(transit, cell_lane, n_lanes):
+    medians = np.full(n_lanes, np.nan)
+    raw_lane = cell_lane[transit['raw_cell']]
+    raw_hours = transit['raw_hours'][raw_lane >= 0]
+    raw_lane = raw_lane[raw_lane >= 0]
+    hist_lane = cell_lane[transit['hist_cell']]
+    selected = hist_lane >= 0
+    hist_lane = hist_lane[selected]
+
+    # Lane con almeno una cella a istogramma: mediana stimata
+    estimated = np.zeros(n_lanes, dtype=bool)
+    estimated[hist_lane] = True
+    if estimated.any():
+        position = np.full(n_lanes, -1)
+        position[estimated] = np.arange(estimated.sum())
+        hist = np.zeros((estimated.sum(), len(TRANSIT_BINS) - 1), dtype=np.int64)
+        np.add.at(hist, (position[hist_lane], transit['hist_bin'][selected]), transit['hist_count'][selected])
+        from_raw = estimated[raw_lane]
+        np.add.at(hist, (position[raw_lane[from_raw]], _transit_bin(raw_hours[from_raw])), 1)
+        medians[estimated] = _hist_median(hist)
+
+    # Tutte le altre: mediana esatta sui valori grezzi
+    exact = ~estimated[raw_lane]
+    exact_medians = pd.Series(raw_hours[exact]).groupby(raw_lane[exact]).median()
+    medians[exact_medians.index.to_numpy()] = exact_medians.to_numpy()
+    return medians, estimated
+
+
+def lane_matrix(cube, transit, mask=None):
+    selected = np.arange(len(cube)) if mask is None else np.flatnonzero(mask)
+    cube = cube.iloc[selected]
+    if len(cube) == 0:
+        return pd.DataFrame(
+            columns=LANE_COLUMNS,
+            index=pd.MultiIndex.from_tuples([], names=LANE_KEYS)
+        )
+
+    codes, lanes = pd.MultiIndex.from_frame(cube[LANE_KEYS]).factorize()
+    sums = cube[['count', 'km_sum', 'km_count', 'ontime_count']].groupby(codes).sum()
+    # Lane di ogni cella del cubo (-1 = cella esclusa dal filtro)
+    cell_lane = np.full(transit['cells'], -1)
+    cell_lane[selected] = codes
+    medians, estimated = _lane_medians(transit, cell_lane, len(lanes))
+
+    matrix = pd.DataFrame({
+        'Num. Spedizioni': sums['count'].to_numpy(),
+        'Distanza Totale (KM)': sums['km_sum'].to_numpy(),
+        'Distanza Media (KM)': (sums['km_sum'] / sums['km_count'].where(sums['km_count'] > 0)).to_numpy(),
+        'Quota On-Time': (sums['ontime_count'] / sums['count']).to_numpy(),
+        'Transito Mediano (ore)': medians,
+        'Mediana Stimata': estimated
+    }, index=lanes.set_names(LANE_KEYS))
+    # Indice ordinato: lookup per lane tramite hash dell'indice
+    return matrix.sort_index()
+
+
+def lane_kpis(matrix, origin, destination):
+    try:
+        return matrix.loc[(origin, destination)]
+    except KeyError:
+        return None
+
+
+def top_lanes(matrix, column, k=10, ascending=False):
+    ranked = matrix.dropna(subset=[column])
+    if ascending:
+        return ranked.nsmallest(k, column)
+    return ranked.nlargest(k, column)
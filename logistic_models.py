@@ -0,0 +1,138 @@
+
+import pandas as pd
+import math
+import time
+import pickle
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, TimeSeriesSplit
+
+# Feature engineering e modelli condivisi tra dashboard e precalcolo offline
+
+# Campioni minimi di validazione per fold al primo turno della successive
+# halving, quello con meno dati: sotto questa soglia l'R² non e' significativo
+MIN_FOLD_SAMPLES = 20
+HALVING_FACTOR = 3
+
+# Spazi di ricerca per la valutazione con cross-validation
+SEARCH_SPACES = {
+    'Random Forest': (
+        RandomForestRegressor(random_state=42),
+        {
+            'n_estimators': [50, 100, 200],
+            'max_depth': [None, 10, 20],
+            'min_samples_leaf': [1, 5, 10],
+            'max_features': [1.0, 'sqrt']
+        }
+    ),
+    'Gradient Boosting (HistGB)': (
+        # early_stopping: le iterazioni si fermano sul validation interno
+        HistGradientBoostingRegressor(random_state=42, early_stopping=True),
+        {
+            'learning_rate': [0.03, 0.1, 0.3],
+            'max_leaf_nodes': [15, 31, 63],
+            'min_samples_leaf': [10, 20, 50],
+            'l2_regularization': [0.0, 1.0]
+        }
+    )
+}
+
+
+def prepare_features(data):
+    features = pd.DataFrame()
+
+    # Features temporali
+    features['month'] = data['BookingID_Date'].dt.month
+    features['day_of_week'] = data['BookingID_Date'].dt.dayofweek
+
+    # One-hot encoding
+    vehicle_dummies = pd.get_dummies(data['vehicleType'], prefix='vehicle')
+    material_dummies = pd.get_dummies(data['Material Shipped'], prefix='material')
+
+    return pd.concat([features, vehicle_dummies, material_dummies], axis=1)
+
+
+def align_features(X, feature_columns):
+    # Aggiungi colonne mancanti e riordina come in addestramento
+    for col in feature_columns:
+        if col not in X.columns:
+            X[col] = 0
+    return X[feature_columns]
+
+
+def _training_rows(data, target_col):
+    return data[data[target_col].notna() & data['BookingID_Date'].notna()]
+
+
+def train_model(data, target_col, max_depth=None):
+    data = _training_rows(data, target_col)
+    X = prepare_features(data)
+    model = RandomForestRegressor(n_estimators=100, max_depth=max_depth, random_state=42, n_jobs=-1)
+    model.fit(X, data[target_col])
+    return model, X.columns
+
+
+def min_search_rows(n_splits, n_candidates, factor=HALVING_FACTOR):
+    # Con min_resources='exhaust' il primo turno usa n // factor**k righe
+    # (k + 1 turni per scartare i candidati) e TimeSeriesSplit le divide in
+    # n_splits + 1 blocchi: ogni fold di validazione deve avere MIN_FOLD_SAMPLES righe
+    k = math.floor(math.log(n_candidates) / math.log(factor))
+    return MIN_FOLD_SAMPLES * (n_splits + 1) * factor ** k
+
+
+def search_models(data, target_col, n_splits=5, n_candidates=12, n_jobs=-1):
+    # Cross-validation in ordine temporale su BookingID_Date: ogni fold valida
+    # su prenotazioni successive a quelle di training. La successive halving
+    # scarta i candidati peggiori su campioni ridotti prima di usare tutti i
+    # dati; fold e candidati sono distribuiti su tutti i core.
+    data = _training_rows(data, target_col).sort_values('BookingID_Date', kind='stable')
+    X = prepare_features(data)
+    y = data[target_col]
+    min_rows = min_search_rows(n_splits, n_candidates)
+    if len(X) < min_rows:
+        raise ValueError(
+            f"Dati insufficienti per la cross-validation: {len(X)} righe valide, "
+            f"almeno {min_rows} per {n_splits} fold e {n_candidates} candidati"
+        )
+    cv = TimeSeriesSplit(n_splits=n_splits)
+
+    results = []
+    best = None
+    for name, (estimator, space) in SEARCH_SPACES.items():
+        search = HalvingRandomSearchCV(
+            estimator,
+            space,
+            n_candidates=n_candidates,
+            cv=cv,
+            factor=HALVING_FACTOR,
+            resource='n_samples',
+            min_resources='exhaust',
+            scoring='r2',
+            n_jobs=n_jobs,
+            random_state=42
+        )
+        start = time.perf_counter()
+        search.fit(X, y)
+        elapsed = time.perf_counter() - start
+
+        cv_results = pd.DataFrame(search.cv_results_)
+        if cv_results['mean_test_score'].isna().all():
+            continue
+        best_row = cv_results.loc[search.best_index_]
+        results.append({
+            'Modello': name,
+            'R² CV medio': search.best_score_,
+            'R² CV dev. std': best_row['std_test_score'],
+            'Parametri migliori': search.best_params_,
+            'Candidati valutati': search.n_candidates_[0],
+            'Tempo fit configurazione (s)': best_row['mean_fit_time'],
+            'Tempo ricerca (s)': elapsed,
+            'Memoria modello (MB)': len(pickle.dumps(search.best_estimator_)) / 1024 ** 2
+        })
+        if best is None or search.best_score_ > best[0]:
+            best = (search.best_score_, name, search.best_estimator_)
+
+    if best is None:
+        raise ValueError("Nessun modello valutato correttamente: tutti i punteggi R² sono NaN")
+    results = pd.DataFrame(results).sort_values('R² CV medio', ascending=False).reset_index(drop=True)
+    return results, best[1], best[2], X.columns
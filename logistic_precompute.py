@@ -0,0 +1,247 @@
+
+import pandas as pd
+import numpy as np
+import os
+import json
+import pickle
+import shutil
+import argparse
+from datetime import datetime
+from logistic_ingest import content_digest, load_uploads
+from logistic_lanes import location_table, build_lane_cube
+from logistic_sketches import build_daily_sketches
+from logistic_models import train_model
+
+# Precalcolo offline per le dashboard.
+# Legge i CSV grezzi (anche .csv.gz / .zip) e scrive una cartella versionata:
+#   manifest.json                    schema, versione e metadati
+#   columns/col_NNN.npy              colonne tipizzate (numeri, date in ns, codici categorie)
+#   columns/col_NNN.categories.npy   categorie delle colonne codificate
+#   locations.pkl                    tabella delle localita' con coordinate
+#   rollups.pkl                      cubo delle lane e sketch giornalieri
+#   indexes/*.npy                    indici per i filtri (giorno, veicolo, materiale)
+#   models.pkl                       modelli pre-addestrati (opzionale)
+# Le dashboard aprono le colonne con np.load(mmap_mode='r'); rollup e modelli
+# si leggono solo quando servono (load_artifact_part).
+#
+# Uso (anche da cron):
+#   python logistic_precompute.py sample_data/Primary_data.csv --output artifacts
+
+ARTIFACT_FORMAT = 2
+ARTIFACT_ENV = 'LOGISTIC_ARTIFACT'
+DATE_COLUMNS = [
+    'BookingID_Date', 'Data_Ping_time', 'Planned_ETA',
+    'actual_eta', 'trip_start_date', 'trip_end_date'
+]
+INDEX_COLUMNS = ['vehicleType', 'Material Shipped']
+MODEL_TARGETS = ['TRANSPORTATION_DISTANCE_IN_KM']
+# Profondita' massima degli alberi pre-addestrati: la dimensione del modello
+# non cresce con lo storico
+MODEL_MAX_DEPTH = 12
+
+
+def _write_column(path, series):
+    # Restituisce la descrizione della colonna per il manifest
+    if pd.api.types.is_datetime64_any_dtype(series):
+        np.save(path, series.to_numpy(dtype='datetime64[ns]'))
+        return {'kind': 'datetime'}
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        np.save(path, series.to_numpy())
+        return {'kind': 'numeric'}
+    if pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+        codes, categories = pd.factorize(series, sort=True)
+        # Identificativi quasi unici (BookingID, ...): le categorie peserebbero
+        # quanto la colonna, restano valori semplici
+        if len(categories) <= len(series) // 2:
+            # Codici nel tipo intero scelto da pandas per queste categorie,
+            # cosi' in lettura restano in memory-map senza conversioni
+            np.save(path, pd.Categorical.from_codes(codes, categories).codes)
+            np.save(_categories_path(path), np.asarray(categories, dtype=str))
+            return {'kind': 'category'}
+    # Colonne object (tipi misti o quasi uniche): salvate cosi' come sono (senza memory-map)
+    np.save(path, series.to_numpy(dtype=object), allow_pickle=True)
+    return {'kind': 'object'}
+
+
+def _categories_path(path):
+    return path[:-len('.npy')] + '.categories.npy'
+
+
+def _write_index(directory, name, keys):
+    # Indice CSR: righe ordinate per chiave e offset di inizio di ogni chiave
+    codes, values = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind='stable')
+    offsets = np.searchsorted(codes[order], np.arange(len(values) + 1))
+    np.save(os.path.join(directory, f"{name}_order.npy"), order.astype(np.int64))
+    np.save(os.path.join(directory, f"{name}_offsets.npy"), offsets.astype(np.int64))
+    return {'file': name, 'keys': [str(v) for v in values]}
+
+
+def build_artifact(paths, output_dir, with_models=False):
+    payloads = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            payloads.append((os.path.basename(path), f.read()))
+    digest = content_digest(payload for _, payload in payloads)
+    data = load_uploads(payloads)
+    for col in DATE_COLUMNS:
+        if col in data.columns:
+            data[col] = pd.to_datetime(data[col], errors='coerce')
+
+    version = f"{datetime.now():%Y%m%dT%H%M%S}-{digest[:12]}"
+    target = os.path.join(output_dir, version)
+    staging = target + '.tmp'
+    os.makedirs(os.path.join(staging, 'columns'))
+    os.makedirs(os.path.join(staging, 'indexes'))
+
+    columns = []
+    for i, col in enumerate(data.columns):
+        spec = _write_column(os.path.join(staging, 'columns', f"col_{i:03d}.npy"), data[col])
+        columns.append(dict(spec, name=col, file=f"col_{i:03d}.npy"))
+
+    indexes = {}
+    days = data['BookingID_Date'].dt.strftime('%Y-%m-%d').fillna('')
+    indexes['Giorno'] = _write_index(os.path.join(staging, 'indexes'), 'Giorno', days)
+    for i, col in enumerate(INDEX_COLUMNS):
+        indexes[col] = _write_index(os.path.join(staging, 'indexes'), f"idx_{i:03d}", data[col].astype(str))
+
+    location_table(data).to_pickle(os.path.join(staging, 'locations.pkl'))
+
+    lane_cube, lane_transit = build_lane_cube(data)
+    with open(os.path.join(staging, 'rollups.pkl'), 'wb') as f:
+        pickle.dump({
+            'lane_cube': lane_cube,
+            'lane_transit': lane_transit,
+            'daily_sketches': build_daily_sketches(data)
+        }, f)
+
+    models = {}
+    if with_models:
+        for target_col in MODEL_TARGETS:
+            if target_col in data.columns:
+                models[target_col] = train_model(data, target_col, max_depth=MODEL_MAX_DEPTH)
+        with open(os.path.join(staging, 'models.pkl'), 'wb') as f:
+            pickle.dump(models, f)
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'version': version,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'sources': [name for name, _ in payloads],
+        'digest': digest,
+        'rows': len(data),
+        'columns': columns,
+        'indexes': indexes,
+        'models': sorted(models)
+    }
+    with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # Pubblicazione atomica della versione e aggiornamento del puntatore
+    os.rename(staging, target)
+    with open(os.path.join(output_dir, 'LATEST.tmp'), 'w') as f:
+        f.write(version)
+    os.replace(os.path.join(output_dir, 'LATEST.tmp'), os.path.join(output_dir, 'LATEST'))
+    return target
+
+
+def resolve_artifact(path):
+    # Accetta sia una versione sia la cartella radice con il file LATEST
+    if os.path.exists(os.path.join(path, 'manifest.json')):
+        return path
+    with open(os.path.join(path, 'LATEST')) as f:
+        return os.path.join(path, f.read().strip())
+
+
+def load_artifact(path):
+    path = resolve_artifact(path)
+    with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest['format'] != ARTIFACT_FORMAT:
+        raise ValueError(f"Formato artifact non supportato: {manifest['format']}")
+
+    data = {}
+    for spec in manifest['columns']:
+        file_path = os.path.join(path, 'columns', spec['file'])
+        if spec['kind'] == 'object':
+            values = np.load(file_path, allow_pickle=True)
+        else:
+            values = np.load(file_path, mmap_mode='r')
+        if spec['kind'] == 'category':
+            # Categorie costruite sui codici in memory-map (-1 = valore mancante)
+            categories = pd.Index(np.load(_categories_path(file_path)), dtype=object)
+            values = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(categories), validate=False)
+        data[spec['name']] = values
+    data = pd.DataFrame(data, copy=False)
+
+    indexes = {}
+    for name, spec in manifest['indexes'].items():
+        indexes[name] = {
+            'keys': spec['keys'],
+            'order': np.load(os.path.join(path, 'indexes', f"{spec['file']}_order.npy"), mmap_mode='r'),
+            'offsets': np.load(os.path.join(path, 'indexes', f"{spec['file']}_offsets.npy"), mmap_mode='r')
+        }
+
+    return dict(
+        path=path,
+        manifest=manifest,
+        data=data,
+        locations=pd.read_pickle(os.path.join(path, 'locations.pkl')),
+        indexes=indexes
+    )
+
+
+def load_artifact_part(artifact, name):
+    # Parti pesanti lette su richiesta: 'rollups' o 'models' (se presenti)
+    if name == 'models' and not artifact['manifest']['models']:
+        return {}
+    with open(os.path.join(artifact['path'], f"{name}.pkl"), 'rb') as f:
+        return pickle.load(f)
+
+
+def index_mask(index, keys, size):
+    # Righe corrispondenti alle chiavi selezionate, lette dalle fette dell'indice
+    mask = np.zeros(size, dtype=bool)
+    positions = {key: i for i, key in enumerate(index['keys'])}
+    for key in keys:
+        i = positions.get(str(key))
+        if i is not None:
+            mask[index['order'][index['offsets'][i]:index['offsets'][i + 1]]] = True
+    return mask
+
+
+def date_index_mask(index, date_range, size):
+    # Le chiavi del giorno sono ordinate: l'intervallo e' una fetta contigua
+    keys = np.array(index['keys'], dtype=object)
+    start = np.searchsorted(keys, str(date_range[0]), side='left')
+    stop = np.searchsorted(keys, str(date_range[1]), side='right')
+    mask = np.zeros(size, dtype=bool)
+    mask[index['order'][index['offsets'][start]:index['offsets'][stop]]] = True
+    return mask
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precalcola un artifact per le dashboard logistiche a partire dai CSV grezzi"
+    )
+    parser.add_argument('inputs', nargs='+', help="File .csv, .csv.gz o .zip da elaborare")
+    parser.add_argument('--output', default='artifacts', help="Cartella radice degli artifact")
+    parser.add_argument('--models', action='store_true', help="Addestra e salva anche i modelli")
+    parser.add_argument('--keep', type=int, default=0, help="Numero di versioni da conservare (0 = tutte)")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    target = build_artifact(args.inputs, args.output, with_models=args.models)
+    print(f"Artifact scritto in {target}")
+
+    if args.keep > 0:
+        versions = sorted(
+            name for name in os.listdir(args.output)
+            if os.path.exists(os.path.join(args.output, name, 'manifest.json'))
+        )
+        for name in versions[:-args.keep]:
+            shutil.rmtree(os.path.join(args.output, name))
+
+
+if __name__ == '__main__':
+    main()
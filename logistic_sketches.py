@@ -0,0 +1,132 @@
+
+import pandas as pd
+import numpy as np
+
+# Sketch mergeabili per campi ad alta cardinalita'.
+# Per ogni giorno si mantiene un HyperLogLog (conteggi distinti) e un
+# Count-Min con i candidati piu' frequenti (classifiche top-N): un intervallo
+# di date si risolve fondendo gli sketch dei giorni, con memoria ed errore
+# limitati indipendentemente dal numero di righe.
+
+SKETCH_FIELDS = {
+    'vehicle_no': 'Veicoli Attivi',
+    'customerID': 'Clienti',
+    'supplierNameCode': 'Fornitori',
+    'Driver_Name': 'Autisti'
+}
+
+
+def hash_values(values):
+    # Hash a 64 bit stabile tra esecuzioni (non dipende da PYTHONHASHSEED)
+    return pd.util.hash_pandas_object(pd.Series(values, dtype=object), index=False).to_numpy()
+
+
+class HyperLogLog:
+    # Errore standard ~ 1.04 / sqrt(2**precision), 2**precision byte di memoria
+    def __init__(self, precision=11):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        if len(hashes) == 0:
+            return
+        p = self.precision
+        idx = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Posizione del primo bit a 1 nei restanti 64 - p bit
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (64 - p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        # Correzione per cardinalita' piccole (linear counting)
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class CountMinSketch:
+    # Sovrastima al piu' e * N / width con probabilita' 1 - exp(-depth)
+    _SEEDS = np.array([
+        0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93
+    ], dtype=np.uint64)
+
+    def __init__(self, width=512, depth=4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int32)
+
+    def _columns(self, hashes):
+        seeds = self._SEEDS[:self.depth, None]
+        return ((hashes[None, :] * seeds) >> np.uint64(32)) % np.uint64(self.width)
+
+    def add_hashes(self, hashes, counts):
+        columns = self._columns(hashes).astype(np.int64)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+
+    def estimate(self, hashes):
+        columns = self._columns(hashes).astype(np.int64)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other):
+        self.table += other.table
+
+
+class FieldSketch:
+    def __init__(self, precision=11, width=512, depth=4, candidates=50):
+        self.hll = HyperLogLog(precision)
+        self.cms = CountMinSketch(width, depth)
+        self.max_candidates = candidates
+        self.candidates = set()
+
+    def add(self, values):
+        counts = pd.Series(values).dropna().value_counts()
+        if len(counts) == 0:
+            return
+        hashes = hash_values(counts.index)
+        self.hll.add_hashes(hashes)
+        self.cms.add_hashes(hashes, counts.to_numpy())
+        self.candidates.update(counts.index[:self.max_candidates])
+
+    def merge(self, other):
+        self.hll.merge(other.hll)
+        self.cms.merge(other.cms)
+        self.candidates |= other.candidates
+
+    def distinct(self):
+        return self.hll.count()
+
+    def heavy_hitters(self, n=10):
+        if not self.candidates:
+            return pd.Series(dtype=np.int64)
+        keys = list(self.candidates)
+        estimates = pd.Series(self.cms.estimate(hash_values(keys)), index=keys)
+        return estimates.nlargest(n)
+
+
+def build_daily_sketches(data, fields=SKETCH_FIELDS):
+    days = pd.to_datetime(data['BookingID_Date'], errors='coerce').dt.date
+    daily = {}
+    for day, rows in data.groupby(days):
+        daily[day] = {}
+        for field in fields:
+            sketch = FieldSketch()
+            sketch.add(rows[field])
+            daily[day][field] = sketch
+    return daily
+
+
+def merge_daily_sketches(daily, date_range, field):
+    merged = FieldSketch()
+    for day, sketches in daily.items():
+        if date_range[0] <= day <= date_range[1]:
+            merged.merge(sketches[field])
+    return merged